@@ -0,0 +1,152 @@
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("psutil")
+
+from trabalhoFinal import ProcessMonitor
+
+INTERVALO_TESTE = 0.05
+TIMEOUT_TESTE = 10
+
+
+def threads_coletoras():
+    return [
+        t for t in threading.enumerate() if t.name == "ProcessMonitor" and t.is_alive()
+    ]
+
+
+@pytest.fixture
+def monitor():
+    m = ProcessMonitor(interval=INTERVALO_TESTE, top_n=3)
+    yield m
+    m.stop()
+
+
+def test_primeiro_snapshot_e_sequencia_crescente(monitor):
+    gerador = monitor.snapshots(timeout=TIMEOUT_TESTE)
+    monitor.start()
+
+    primeiro = next(gerador)
+    segundo = next(gerador)
+
+    assert primeiro.sequencia == 1
+    assert segundo.sequencia > primeiro.sequencia
+    assert primeiro.processos  # Pelo menos o próprio processo
+    assert monitor.latest().sequencia >= segundo.sequencia
+
+
+def test_consumidor_atrasado_recebe_todos_em_ordem(monitor):
+    gerador = monitor.snapshots(timeout=TIMEOUT_TESTE)
+    monitor.start()
+    prazo = time.monotonic() + TIMEOUT_TESTE
+    while monitor.latest().sequencia < 5 and time.monotonic() < prazo:
+        time.sleep(INTERVALO_TESTE)
+
+    assert [next(gerador).sequencia for _ in range(5)] == [1, 2, 3, 4, 5]
+
+
+def test_inscritos_recebem_o_mesmo_objeto(monitor):
+    recebidos_a, recebidos_b = [], []
+    pronto = threading.Event()
+    monitor.subscribe(recebidos_a.append)
+
+    def inscrito_b(snapshot):
+        recebidos_b.append(snapshot)
+        pronto.set()
+
+    monitor.subscribe(inscrito_b)
+    monitor.start()
+    assert pronto.wait(TIMEOUT_TESTE)
+    monitor.stop()
+
+    assert recebidos_a[0] is recebidos_b[0]
+
+
+def test_erro_em_callback_nao_interrompe_publicacao(monitor):
+    recebidos = []
+    pronto = threading.Event()
+
+    def inscrito_com_erro(snapshot):
+        raise RuntimeError("falha proposital")
+
+    def inscrito_ok(snapshot):
+        recebidos.append(snapshot)
+        if len(recebidos) >= 2:
+            pronto.set()
+
+    monitor.subscribe(inscrito_com_erro)
+    monitor.subscribe(inscrito_ok)
+    monitor.start()
+
+    assert pronto.wait(TIMEOUT_TESTE)
+    assert monitor.is_running()
+
+
+def test_stop_encerra_gerador_em_espera():
+    monitor = ProcessMonitor(interval=60, top_n=1)
+    recebeu = threading.Event()
+    terminou = threading.Event()
+    gerador = monitor.snapshots()
+
+    def consumir():
+        for _ in gerador:
+            recebeu.set()  # Depois disso fica esperando o próximo (intervalo de 60s)
+        terminou.set()
+
+    consumidor = threading.Thread(target=consumir, daemon=True)
+    consumidor.start()
+    monitor.start()
+    assert recebeu.wait(TIMEOUT_TESTE)
+    monitor.stop()
+
+    assert terminou.wait(TIMEOUT_TESTE)
+    assert list(monitor.snapshots()) == []  # Já parado: termina na hora
+
+
+def test_stop_e_start_deixam_uma_unica_thread(monitor):
+    monitor.start()
+    monitor.stop(timeout=0)
+    monitor.start()
+
+    assert monitor.is_running()
+    assert len(threads_coletoras()) == 1
+
+    monitor.stop()
+    assert threads_coletoras() == []
+
+
+def test_erro_no_ciclo_nao_mata_a_coleta(monitor, monkeypatch):
+    coletar_original = monitor._coletar_processos
+    chamadas = []
+
+    def coletar_com_falha():
+        chamadas.append(1)
+        if len(chamadas) == 1:
+            raise RuntimeError("falha proposital")
+        return coletar_original()
+
+    monkeypatch.setattr(monitor, "_coletar_processos", coletar_com_falha)
+    gerador = monitor.snapshots(timeout=TIMEOUT_TESTE)
+    monitor.start()
+
+    assert next(gerador).sequencia == 1
+    assert monitor.is_running()
+
+
+@pytest.mark.parametrize(
+    "kwargs, erro",
+    [
+        ({"top_n": 5.0}, TypeError),
+        ({"top_n": "5"}, TypeError),
+        ({"interval": "2"}, TypeError),
+        ({"top_n": -1}, ValueError),
+        ({"interval": 0}, ValueError),
+        ({"interval": float("nan")}, ValueError),
+        ({"interval": float("inf")}, ValueError),
+    ],
+)
+def test_parametros_invalidos(kwargs, erro):
+    with pytest.raises(erro):
+        ProcessMonitor(**kwargs)
@@ -3,33 +3,51 @@ import time
 import os
 import threading
 import sys
-import msvcrt
+import logging
+import math
+from collections import deque, namedtuple
+from types import MappingProxyType
 
 # --- Configurações e Variáveis Globais ---
-DADOS_PROCESSOS_COMPARTILHADOS = []
-LOCK_DADOS = threading.Lock()
-CONTINUAR_EXECUCAO = True
-PID_MONITORAMENTO_DETALHADO = None
-DADOS_MONITORAMENTO_DETALHADO = {}
-PICOS_MEMORIA_MB = {}
 NUM_ATUALIZACOES = 0
+INTERVALO_COLETA_PADRAO = 2
+TOP_N_PADRAO = 20
+# Snapshots recentes guardados para que geradores de snapshots() não percam
+# nenhum; um consumidor mais atrasado que isso pula para o mais antigo guardado.
+TAMANHO_HISTORICO_SNAPSHOTS = 64
+
+logger = logging.getLogger(__name__)
 
 # Mapeamento de prioridades
 # As constantes reais de psutil são usadas ao definir.
-PRIORIDADES_WINDOWS_MAP = {
-    psutil.REALTIME_PRIORITY_CLASS: "Tempo Real",
-    psutil.HIGH_PRIORITY_CLASS: "Alta",
-    psutil.ABOVE_NORMAL_PRIORITY_CLASS: "Acima do Normal",
-    psutil.NORMAL_PRIORITY_CLASS: "Normal",
-    psutil.BELOW_NORMAL_PRIORITY_CLASS: "Abaixo do Normal",
-    psutil.IDLE_PRIORITY_CLASS: "Ociosa",
-}
+# Fora do Windows essas constantes não existem; o mapa fica vazio para que o
+# módulo continue importável (ex: embutido em outro serviço).
+if hasattr(psutil, "REALTIME_PRIORITY_CLASS"):
+    PRIORIDADES_WINDOWS_MAP = {
+        psutil.REALTIME_PRIORITY_CLASS: "Tempo Real",
+        psutil.HIGH_PRIORITY_CLASS: "Alta",
+        psutil.ABOVE_NORMAL_PRIORITY_CLASS: "Acima do Normal",
+        psutil.NORMAL_PRIORITY_CLASS: "Normal",
+        psutil.BELOW_NORMAL_PRIORITY_CLASS: "Abaixo do Normal",
+        psutil.IDLE_PRIORITY_CLASS: "Ociosa",
+    }
+else:
+    PRIORIDADES_WINDOWS_MAP = {}
+
+# Snapshot imutável publicado a cada ciclo de coleta.
+# - sequencia: contador crescente de snapshots do monitor
+# - timestamp: time.time() do fim da coleta
+# - processos: tupla de mapeamentos somente-leitura (mesmas chaves de sempre)
+# - detalhado: mapeamento somente-leitura do monitoramento detalhado (vazio se inativo)
+Snapshot = namedtuple("Snapshot", ["sequencia", "timestamp", "processos", "detalhado"])
+
+SNAPSHOT_VAZIO = Snapshot(0, 0.0, (), MappingProxyType({}))
 
 
 def limpar_tela():
+    """Limpa o terminal."""
     global NUM_ATUALIZACOES
     NUM_ATUALIZACOES += 1
-    """Limpa o terminal."""
     os.system("cls")
     print("Num atualizacoes: ", NUM_ATUALIZACOES)
 
@@ -42,13 +60,256 @@ def obter_nome_prioridade_windows(pid):
         return "N/A"
 
 
-# --- Thread de Coleta de Dados ---
-def thread_coleta_dados():
-    """Thread que coleta informações dos processos periodicamente."""
-    global DADOS_PROCESSOS_COMPARTILHADOS, CONTINUAR_EXECUCAO, PID_MONITORAMENTO_DETALHADO, DADOS_MONITORAMENTO_DETALHADO, PICOS_MEMORIA_MB
-    script_pid = os.getpid()  # Obtém o PID do script atual
+def obter_detalhes_processo(pid, process_name, cmdline):
+    """Retorna uma descrição amigável do processo (hoje só para o Chrome)."""
+    detalhes_processo = "N/A"
+    if process_name and process_name.lower() == "chrome.exe":
+        if cmdline:
+            is_renderer = any("--type=renderer" in arg for arg in cmdline)
+            is_gpu = any("--type=gpu-process" in arg for arg in cmdline)
+            is_utility = any("--type=utility" in arg for arg in cmdline)
+            is_extension = any("--extension-process" in arg for arg in cmdline)
+
+            if is_renderer:
+                detalhes_processo = "Chrome Tab/Ext"
+                for arg in cmdline:
+                    if arg.startswith("http:") or arg.startswith("https"):
+                        url_part = arg.split("?")[0]
+                        if len(url_part) > 18:
+                            url_part = url_part[:15] + "..."
+
+                        detalhes_processo += f": {url_part}"
+                        break
+                    elif "--app-id=" in arg:
+                        app_id = arg.split("=")[1]
+                        detalhes_processo += f": App({app_id[:10]})"
+                        break
+            elif is_gpu:
+                detalhes_processo = "Chrome GPU"
+            elif is_extension:
+                detalhes_processo = "Chrome Extension"
+            elif is_utility:
+                detalhes_processo = "Chrome Utility"
+                if any("--service-sandbox-type=network" in arg for arg in cmdline):
+                    detalhes_processo = "Chrome Network Service"
+                elif any("crashpad-handler" in arg for arg in cmdline):
+                    detalhes_processo = "Chrome Crashpad"
+            elif not any(arg.startswith("--type=") for arg in cmdline) and not any(
+                arg.startswith("--extension-process") for arg in cmdline
+            ):
+                try:
+                    parent_proc = psutil.Process(pid)
+                    children = parent_proc.children(recursive=False)
+                    if any(child.name().lower() == "chrome.exe" for child in children):
+                        detalhes_processo = "Chrome Principal"
+                    else:
+                        detalhes_processo = "Chrome (Outro)"
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    detalhes_processo = "Chrome (Principal?)"
+            else:
+                detalhes_processo = "Chrome (Outro)"
+        else:
+            detalhes_processo = "Chrome (sem cmdline)"
+    return detalhes_processo
+
+
+# --- Coletor de Dados ---
+class ProcessMonitor:
+    """
+    Coletor de processos embutível, sem dependência de terminal.
+
+    Uma thread em segundo plano coleta os top-N processos por memória (mais o
+    próprio processo) a cada `interval` segundos e publica um `Snapshot`
+    imutável. O mesmo objeto é entregue a todos os consumidores, sem cópias:
+    via `latest()`, pelo gerador `snapshots()` ou por callbacks registrados
+    com `subscribe()`. Cada instância tem seu próprio estado, então várias
+    podem rodar no mesmo processo.
+
+    Exemplo:
+        with ProcessMonitor(interval=5, top_n=10) as monitor:
+            for snap in monitor.snapshots():
+                ...
+    """
+
+    def __init__(self, interval=INTERVALO_COLETA_PADRAO, top_n=TOP_N_PADRAO):
+        if isinstance(interval, bool) or not isinstance(interval, (int, float)):
+            raise TypeError("interval deve ser um número.")
+        if isinstance(top_n, bool) or not isinstance(top_n, int):
+            raise TypeError("top_n deve ser um inteiro.")
+        if not (math.isfinite(interval) and interval > 0):
+            raise ValueError("interval deve ser finito e maior que zero.")
+        if top_n < 0:
+            raise ValueError("top_n não pode ser negativo.")
+        self.interval = interval
+        self.top_n = top_n
+
+        self._condicao = threading.Condition()
+        # Um Event por execução: uma thread antiga nunca "revive" com start()
+        self._parar = threading.Event()
+        self._thread = None
+        self._snapshot = SNAPSHOT_VAZIO
+        self._historico = deque(maxlen=TAMANHO_HISTORICO_SNAPSHOTS)
+        self._inscritos = ()  # Tupla trocada a cada alteração: iterar não exige lock
+        self._picos_memoria_mb = {}
+        self._pid_detalhado = None
+
+    # --- Ciclo de vida ---
+    def start(self):
+        """Inicia a thread de coleta. Chamar novamente enquanto ativo não faz nada."""
+        if self.is_running():
+            return self
+        thread_anterior = self._thread
+        if (
+            thread_anterior is not None
+            and thread_anterior is not threading.current_thread()
+        ):
+            # Parada já sinalizada (ex: stop com timeout expirado): espera a
+            # thread antiga terminar, fora do lock que ela usa ao sair
+            thread_anterior.join()
+        with self._condicao:
+            if self.is_running():
+                return self
+            if self._parar.is_set():
+                self._parar = threading.Event()
+            self._thread = threading.Thread(
+                target=self._executar,
+                args=(self._parar,),
+                name="ProcessMonitor",
+                daemon=True,
+            )
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        """Sinaliza a parada, acorda quem está em `snapshots()` e aguarda a thread."""
+        with self._condicao:
+            self._parar.set()
+            self._condicao.notify_all()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def is_running(self):
+        return (
+            self._thread is not None
+            and self._thread.is_alive()
+            and not self._parar.is_set()
+        )
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    # --- Consumo dos dados ---
+    def latest(self):
+        """Retorna o snapshot mais recente (SNAPSHOT_VAZIO antes da primeira coleta)."""
+        return self._snapshot
+
+    def snapshots(self, timeout=None):
+        """
+        Retorna um gerador bloqueante que produz, em ordem, cada snapshot
+        publicado após esta chamada (o atual, se houver, fica em `latest()`).
+        Termina quando o monitor é parado, imediatamente se já estiver parado,
+        ou, se `timeout` for informado, quando nenhum snapshot novo chegar
+        dentro desse tempo. Um consumidor atrasado em mais de
+        TAMANHO_HISTORICO_SNAPSHOTS snapshots pula os que já foram descartados.
+        """
+        # Ponto de partida lido aqui, e não na primeira iteração do gerador
+        with self._condicao:
+            parar = self._parar
+            ultima_sequencia = self._snapshot.sequencia
+        return self._iterar_snapshots(parar, ultima_sequencia, timeout)
+
+    def _iterar_snapshots(self, parar, ultima_sequencia, timeout):
+        while True:
+            with self._condicao:
+                chegou = self._condicao.wait_for(
+                    lambda: self._snapshot.sequencia > ultima_sequencia
+                    or parar.is_set(),
+                    timeout,
+                )
+                if not chegou or parar.is_set():
+                    return
+                # O histórico tem sequências contíguas, terminando na atual
+                indice = ultima_sequencia + 1 - self._historico[0].sequencia
+                snapshot = self._historico[max(indice, 0)]
+            ultima_sequencia = snapshot.sequencia
+            yield snapshot
+
+    def subscribe(self, callback):
+        """
+        Registra `callback(snapshot)`, chamado na thread de coleta a cada publicação.
+        Todos os inscritos recebem o mesmo objeto; exceções são registradas no log
+        e não interrompem a coleta. Retorna o próprio callback.
+        """
+        with self._condicao:
+            self._inscritos = self._inscritos + (callback,)
+        return callback
+
+    def unsubscribe(self, callback):
+        with self._condicao:
+            self._inscritos = tuple(c for c in self._inscritos if c is not callback)
+
+    # --- Monitoramento detalhado ---
+    @property
+    def detailed_pid(self):
+        return self._pid_detalhado
+
+    def set_detailed_pid(self, pid):
+        """Define o PID do monitoramento detalhado (None para desativar)."""
+        self._pid_detalhado = pid
+
+    # --- Coleta ---
+    def _executar(self, parar):
+        try:
+            # Inicializa a primeira chamada de cpu_percent para todos os processos
+            # para que os próximos resultados sejam mais precisos.
+            for proc in psutil.process_iter():
+                try:
+                    proc.cpu_percent(interval=None)
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    pass  # Ignora processos que não podem ser acessados
+
+            while not parar.is_set():
+                try:
+                    processos = self._coletar_processos()
+                    pid_detalhado = self._pid_detalhado
+                    detalhado = (
+                        self._coletar_detalhado(pid_detalhado) if pid_detalhado else {}
+                    )
+                    self._publicar(parar, processos, MappingProxyType(detalhado))
+                except Exception:
+                    # Um ciclo com erro é descartado; a coleta continua no próximo
+                    logger.exception("Erro em ciclo de coleta do ProcessMonitor.")
+                parar.wait(self.interval)
+        finally:
+            # Qualquer saída da thread encerra os geradores de snapshots()
+            with self._condicao:
+                parar.set()
+                self._condicao.notify_all()
+
+    def _publicar(self, parar, processos, detalhado):
+        with self._condicao:
+            if parar.is_set():
+                return  # Execução já parada: não publica dados atrasados
+            self._snapshot = Snapshot(
+                self._snapshot.sequencia + 1, time.time(), processos, detalhado
+            )
+            snapshot = self._snapshot
+            self._historico.append(snapshot)
+            inscritos = self._inscritos
+            self._condicao.notify_all()
+
+        for callback in inscritos:
+            try:
+                callback(snapshot)
+            except Exception:
+                logger.exception("Erro em callback inscrito no ProcessMonitor.")
 
-    while CONTINUAR_EXECUCAO:
+    def _coletar_processos(self):
+        script_pid = os.getpid()  # Obtém o PID do script atual
         lista_temp_processos = []
 
         # 1. Coleta todos os outros processos
@@ -70,16 +331,16 @@ def thread_coleta_dados():
                 # O processo pode ter terminado, acesso negado ou informações incompletas durante a iteração
                 continue
 
-        # 2. Ordena os outros processos por memória e pega os top 20
+        # 2. Ordena os outros processos por memória e pega os top N
         processos_para_exibir_info = sorted(
             outros_processos_candidatos_info,
             key=lambda p_info: (
                 p_info["memory_info"].rss if p_info.get("memory_info") else 0
             ),
             reverse=True,
-        )[:20]
+        )[: self.top_n]
 
-        # 3. Processa esses top 20 outros processos
+        # 3. Processa esses top N outros processos
         for info in processos_para_exibir_info:
             try:
                 pid = info["pid"]
@@ -89,8 +350,10 @@ def thread_coleta_dados():
                     mem_info_obj.vms / (1024 * 1024) if mem_info_obj else 0
                 )
 
-                PICOS_MEMORIA_MB[pid] = max(PICOS_MEMORIA_MB.get(pid, 0), mem_rss_mb)
-                pico_mem_rss_mb_atual = PICOS_MEMORIA_MB[pid]
+                self._picos_memoria_mb[pid] = max(
+                    self._picos_memoria_mb.get(pid, 0), mem_rss_mb
+                )
+                pico_mem_rss_mb_atual = self._picos_memoria_mb[pid]
 
                 cpu_percent_val = (
                     info["cpu_percent"] if info.get("cpu_percent") is not None else 0.0
@@ -101,81 +364,27 @@ def thread_coleta_dados():
                     else "N/A"
                 )
 
-                detalhes_processo = "N/A"
                 process_name = info.get("name", "")
-                if process_name and process_name.lower() == "chrome.exe":
-                    cmdline = info.get("cmdline")
-                    if cmdline:
-                        is_renderer = any("--type=renderer" in arg for arg in cmdline)
-                        is_gpu = any("--type=gpu-process" in arg for arg in cmdline)
-                        is_utility = any("--type=utility" in arg for arg in cmdline)
-                        is_extension = any(
-                            "--extension-process" in arg for arg in cmdline
-                        )
-
-                        if is_renderer:
-                            detalhes_processo = "Chrome Tab/Ext"
-                            for arg in cmdline:
-                                if arg.startswith("http:") or arg.startswith("https"):
-                                    url_part = arg.split("?")[0]
-                                    if len(url_part) > 18:
-                                        url_part = url_part[:15] + "..."
-
-                                    detalhes_processo += f": {url_part}"
-                                    break
-                                elif "--app-id=" in arg:
-                                    app_id = arg.split("=")[1]
-                                    detalhes_processo += f": App({app_id[:10]})"
-                                    break
-                        elif is_gpu:
-                            detalhes_processo = "Chrome GPU"
-                        elif is_extension:
-                            detalhes_processo = "Chrome Extension"
-                        elif is_utility:
-                            detalhes_processo = "Chrome Utility"
-                            if any(
-                                "--service-sandbox-type=network" in arg
-                                for arg in cmdline
-                            ):
-                                detalhes_processo = "Chrome Network Service"
-                            elif any("crashpad-handler" in arg for arg in cmdline):
-                                detalhes_processo = "Chrome Crashpad"
-                        elif not any(
-                            arg.startswith("--type=") for arg in cmdline
-                        ) and not any(
-                            arg.startswith("--extension-process") for arg in cmdline
-                        ):
-                            try:
-                                parent_proc = psutil.Process(pid)
-                                children = parent_proc.children(recursive=False)
-                                if any(
-                                    child.name().lower() == "chrome.exe"
-                                    for child in children
-                                ):
-                                    detalhes_processo = "Chrome Principal"
-                                else:
-                                    detalhes_processo = "Chrome (Outro)"
-                            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                                detalhes_processo = "Chrome (Principal?)"
-                        else:
-                            detalhes_processo = "Chrome (Outro)"
-                    else:
-                        detalhes_processo = "Chrome (sem cmdline)"
+                detalhes_processo = obter_detalhes_processo(
+                    pid, process_name, info.get("cmdline")
+                )
 
                 lista_temp_processos.append(
-                    {
-                        "pid": pid,
-                        "nome": process_name,
-                        "mem_rss_mb": mem_rss_mb,
-                        "mem_vms_mb": mem_vms_mb,
-                        "pico_mem_rss_mb": pico_mem_rss_mb_atual,
-                        "cpu_percent": cpu_percent_val,
-                        "prioridade_nome": obter_nome_prioridade_windows(pid),
-                        "num_threads": num_threads_val,
-                        "detalhes_processo": detalhes_processo,
-                    }
+                    MappingProxyType(
+                        {
+                            "pid": pid,
+                            "nome": process_name,
+                            "mem_rss_mb": mem_rss_mb,
+                            "mem_vms_mb": mem_vms_mb,
+                            "pico_mem_rss_mb": pico_mem_rss_mb_atual,
+                            "cpu_percent": cpu_percent_val,
+                            "prioridade_nome": obter_nome_prioridade_windows(pid),
+                            "num_threads": num_threads_val,
+                            "detalhes_processo": detalhes_processo,
+                        }
+                    )
                 )
-            except (TypeError, AttributeError, KeyError) as e:
+            except (TypeError, AttributeError, KeyError):
                 continue
 
         # 4. Processa o script atual
@@ -190,62 +399,63 @@ def thread_coleta_dados():
                 script_mem_info.vms / (1024 * 1024) if script_mem_info else 0
             )
 
-            PICOS_MEMORIA_MB[script_pid] = max(
-                PICOS_MEMORIA_MB.get(script_pid, 0), mem_rss_mb_script
+            self._picos_memoria_mb[script_pid] = max(
+                self._picos_memoria_mb.get(script_pid, 0), mem_rss_mb_script
             )
-            pico_mem_script_atual = PICOS_MEMORIA_MB[script_pid]
+            pico_mem_script_atual = self._picos_memoria_mb[script_pid]
 
             lista_temp_processos.append(
-                {
-                    "pid": script_pid,
-                    "nome": p_script.name(),
-                    "mem_rss_mb": mem_rss_mb_script,
-                    "mem_vms_mb": mem_vms_mb_script,
-                    "pico_mem_rss_mb": pico_mem_script_atual,
-                    "cpu_percent": (
-                        script_cpu_val if script_cpu_val is not None else 0.0
-                    ),
-                    "prioridade_nome": obter_nome_prioridade_windows(script_pid),
-                    "num_threads": p_script.num_threads(),
-                    "detalhes_processo": "Este Script Python :)",
-                }
+                MappingProxyType(
+                    {
+                        "pid": script_pid,
+                        "nome": p_script.name(),
+                        "mem_rss_mb": mem_rss_mb_script,
+                        "mem_vms_mb": mem_vms_mb_script,
+                        "pico_mem_rss_mb": pico_mem_script_atual,
+                        "cpu_percent": (
+                            script_cpu_val if script_cpu_val is not None else 0.0
+                        ),
+                        "prioridade_nome": obter_nome_prioridade_windows(script_pid),
+                        "num_threads": p_script.num_threads(),
+                        "detalhes_processo": "Este Script Python :)",
+                    }
+                )
             )
         except (psutil.NoSuchProcess, psutil.AccessDenied, AttributeError):
             # O processo do próprio script não pôde ser acessado (deve ser raro)
             pass
 
-        # 5. Atualiza os dados compartilhados
-        with LOCK_DADOS:
-            DADOS_PROCESSOS_COMPARTILHADOS = lista_temp_processos
-            # Se houver um PID para monitoramento detalhado (lógica permanece a mesma)
-            if PID_MONITORAMENTO_DETALHADO:
-                try:
-                    proc_detalhe = psutil.Process(PID_MONITORAMENTO_DETALHADO)
-                    proc_detalhe.cpu_percent(interval=None)  # Inicializa a medição
-                    time.sleep(0.1)  # Pequeno intervalo para medir corretamente
-                    cpu_percent_val = proc_detalhe.cpu_percent(interval=None)
-                    DADOS_MONITORAMENTO_DETALHADO = {
-                        "pid": proc_detalhe.pid,
-                        "nome": proc_detalhe.name(),
-                        "cpu_percent": cpu_percent_val,
-                        "mem_rss_mb": proc_detalhe.memory_info().rss / (1024 * 1024),
-                        "mem_vms_mb": proc_detalhe.memory_info().vms / (1024 * 1024),
-                        "num_threads": proc_detalhe.num_threads(),
-                        "status": proc_detalhe.status(),
-                        "threads_info": [
-                            {
-                                "id": t.id,
-                                "user_time": t.user_time,
-                                "system_time": t.system_time,
-                            }
-                            for t in proc_detalhe.threads()
-                        ],
-                    }
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    DADOS_MONITORAMENTO_DETALHADO = {
-                        "erro": "Processo não encontrado ou acesso negado."
-                    }
-        time.sleep(2)
+        return tuple(lista_temp_processos)
+
+    def _coletar_detalhado(self, pid):
+        # Fora de qualquer lock: a pausa de 0.1s não bloqueia os consumidores
+        try:
+            proc_detalhe = psutil.Process(pid)
+            proc_detalhe.cpu_percent(interval=None)  # Inicializa a medição
+            time.sleep(0.1)  # Pequeno intervalo para medir corretamente
+            cpu_percent_val = proc_detalhe.cpu_percent(interval=None)
+            mem_info = proc_detalhe.memory_info()
+            return {
+                "pid": proc_detalhe.pid,
+                "nome": proc_detalhe.name(),
+                "cpu_percent": cpu_percent_val,
+                "mem_rss_mb": mem_info.rss / (1024 * 1024),
+                "mem_vms_mb": mem_info.vms / (1024 * 1024),
+                "num_threads": proc_detalhe.num_threads(),
+                "status": proc_detalhe.status(),
+                "threads_info": tuple(
+                    MappingProxyType(
+                        {
+                            "id": t.id,
+                            "user_time": t.user_time,
+                            "system_time": t.system_time,
+                        }
+                    )
+                    for t in proc_detalhe.threads()
+                ),
+            }
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return {"pid": pid, "erro": "Processo não encontrado ou acesso negado."}
 
 
 # --- Funções de Interação com Processos ---
@@ -374,6 +584,9 @@ def obter_input_com_timeout(prompt_text="> ", timeout=5, initial_buffer_str=""):
     e permitindo movimento do cursor com as teclas de seta esquerda/direita.
     Retorna (string_final, True_se_timeout_False_se_enter).
     """
+    # Importado aqui para que o módulo possa ser usado sem console (ProcessMonitor)
+    import msvcrt
+
     buffer = list(initial_buffer_str)
     cursor_idx = len(buffer)  # Posição do cursor dentro do conteúdo do buffer (base 0)
 
@@ -454,13 +667,12 @@ def obter_input_com_timeout(prompt_text="> ", timeout=5, initial_buffer_str=""):
 
 
 # --- Thread de Interface com Usuário ---
-def thread_interface_usuario():
-    global CONTINUAR_EXECUCAO, PID_MONITORAMENTO_DETALHADO, DADOS_MONITORAMENTO_DETALHADO
+def thread_interface_usuario(monitor):
     current_user_input_str = ""
 
     processo_selecionado_local = None
 
-    while CONTINUAR_EXECUCAO:
+    while monitor.is_running():
         limpar_tela()
         print("--- Monitor de Processos Python ---")
         # Ajuste de largura: Detalhes de 30 para 20. Mem Pico adicionado com 14. Mem Virtual adicionada com 18
@@ -471,8 +683,9 @@ def thread_interface_usuario():
         )
         print("-" * 137)  # Ajustado o separador
 
-        with LOCK_DADOS:
-            copia_dados_processos = list(DADOS_PROCESSOS_COMPARTILHADOS)
+        # O snapshot é imutável: não é preciso lock nem cópia
+        snapshot = monitor.latest()
+        copia_dados_processos = snapshot.processos
 
         if not copia_dados_processos:
             print("Coletando dados...")
@@ -493,16 +706,16 @@ def thread_interface_usuario():
         print("-" * 137)  # Ajustado o separador
 
         # Se estiver no modo de monitoramento detalhado
-        if PID_MONITORAMENTO_DETALHADO:
-            print(
-                f"\\n--- Monitoramento Detalhado PID: {PID_MONITORAMENTO_DETALHADO} ---"
-            )
-            with LOCK_DADOS:
-                detalhes = DADOS_MONITORAMENTO_DETALHADO.copy()
+        pid_detalhado = monitor.detailed_pid
+        if pid_detalhado:
+            print(f"\\n--- Monitoramento Detalhado PID: {pid_detalhado} ---")
+            detalhes = snapshot.detalhado
+            if detalhes.get("pid") != pid_detalhado:
+                detalhes = {}  # Dados de um PID anterior, aguarda a próxima coleta
 
             if "erro" in detalhes:
                 print(detalhes["erro"])
-                PID_MONITORAMENTO_DETALHADO = None  # Para de monitorar se deu erro
+                monitor.set_detailed_pid(None)  # Para de monitorar se deu erro
             elif detalhes:
                 cpu_val = detalhes.get("cpu_percent", 0.0)
                 print(
@@ -514,7 +727,7 @@ def thread_interface_usuario():
         print("\\nOpções:")
         print("Digite o '#' do processo para interagir, 's' para sair.")
         # A mensagem "Digite o 'Enter' sem digitar nada para atualizar..." é removida pois o refresh é automático.
-        if PID_MONITORAMENTO_DETALHADO:
+        if monitor.detailed_pid:
             print("'p' para PARAR monitoramento detalhado.")
         else:
             print("'m <#>' para INICIAR monitoramento detalhado (ex: m 1).")
@@ -540,28 +753,23 @@ def thread_interface_usuario():
                     continue
 
                 if comando_processar == "s":
-                    CONTINUAR_EXECUCAO = False
+                    monitor.stop()
                     break
-                elif (
-                    comando_processar.startswith("m ")
-                    and not PID_MONITORAMENTO_DETALHADO
-                ):
+                elif comando_processar.startswith("m ") and not monitor.detailed_pid:
                     try:
                         idx_proc_monitorar = int(comando_processar.split(" ")[1]) - 1
                         if 0 <= idx_proc_monitorar < len(copia_dados_processos):
-                            PID_MONITORAMENTO_DETALHADO = copia_dados_processos[
-                                idx_proc_monitorar
-                            ]["pid"]
-                            DADOS_MONITORAMENTO_DETALHADO = {}  # Limpa dados antigos
+                            monitor.set_detailed_pid(
+                                copia_dados_processos[idx_proc_monitorar]["pid"]
+                            )
                         else:
                             print("Índice inválido para monitoramento.")
                             time.sleep(1)
                     except (IndexError, ValueError):
                         print("Formato inválido para monitoramento (ex: m 1).")
                         time.sleep(1)
-                elif comando_processar == "p" and PID_MONITORAMENTO_DETALHADO:
-                    PID_MONITORAMENTO_DETALHADO = None
-                    DADOS_MONITORAMENTO_DETALHADO = {}
+                elif comando_processar == "p" and monitor.detailed_pid:
+                    monitor.set_detailed_pid(None)
 
                 elif comando_processar.isdigit():
                     idx_selecionado = int(comando_processar) - 1
@@ -613,8 +821,7 @@ def thread_interface_usuario():
                                     )
                                     break
                             elif acao == "5":
-                                PID_MONITORAMENTO_DETALHADO = pid_alvo
-                                DADOS_MONITORAMENTO_DETALHADO = {}
+                                monitor.set_detailed_pid(pid_alvo)
                                 print(
                                     f"Monitoramento detalhado iniciado para PID {pid_alvo}. Retornando à tela principal."
                                 )
@@ -636,7 +843,7 @@ def thread_interface_usuario():
         except Exception as e:
             print(f"Ocorreu um erro na interface: {e}")
             time.sleep(2)
-        if PID_MONITORAMENTO_DETALHADO:
+        if monitor.detailed_pid:
             time.sleep(0.3)
         else:
             time.sleep(0.5)
@@ -650,21 +857,12 @@ if __name__ == "__main__":
     print("Pressione Enter para continuar")
     input()
 
-    # Inicializa a primeira chamada de cpu_percent para todos os processos
-    # para que os próximos resultados sejam mais precisos.
-    for proc in psutil.process_iter():
-        try:
-            proc.cpu_percent(interval=None)
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            pass  # Ignora processos que não podem ser acessados
-
-    coletor_thread = threading.Thread(target=thread_coleta_dados)
-    interface_thread = threading.Thread(target=thread_interface_usuario)
-
-    coletor_thread.start()
+    monitor = ProcessMonitor().start()
+    interface_thread = threading.Thread(
+        target=thread_interface_usuario, args=(monitor,)
+    )
     interface_thread.start()
-
-    coletor_thread.join()
     interface_thread.join()
+    monitor.stop()
 
     print("Monitor de processos finalizado.")